@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppTenantsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_tenants"
+
+    def ready(self):
+        import app_tenants.signals
@@ -0,0 +1,22 @@
+"""
+Кэш результатов поиска арендатора по логину для публичной страницы /into/.
+
+Значение — кортеж (schema_name, domain, tenant_username); промахи не
+кэшируются. Сбрасывается сигналами TenantLogin/TenantLoginIndex.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+LOOKUP_CACHE_TIMEOUT = 60
+
+
+def lookup_cache_key(login: str) -> str:
+    # Хэш вместо сырого ввода: пробелы и длина > 250 дают CacheKeyWarning
+    digest = hashlib.sha256(login.strip().lower().encode()).hexdigest()
+    return f"tenant-login:{digest}"
+
+
+def invalidate_lookup_cache(*logins: str) -> None:
+    cache.delete_many([lookup_cache_key(login) for login in logins if login])
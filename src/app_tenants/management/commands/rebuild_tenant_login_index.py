@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from app_tenants.lookup_cache import invalidate_lookup_cache
+from app_tenants.models import Domain, TenantLoginIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild TenantLoginIndex from users of every tenant schema. "
+        "Run once after deploying the index and whenever it may be out of sync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            action="append",
+            default=None,
+            help="Rebuild only the given tenant schema (may be repeated).",
+        )
+
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        public_schema = get_public_schema_name()
+
+        with schema_context(public_schema):
+            domains = list(
+                Domain.objects.select_related("tenant")
+                .filter(is_primary=True)
+                .exclude(tenant__schema_name=public_schema)
+                .order_by("tenant__schema_name")
+            )
+        if opts["schema"]:
+            domains = [d for d in domains if d.tenant.schema_name in opts["schema"]]
+
+        total = 0
+        for domain in domains:
+            schema_name = domain.tenant.schema_name
+            with schema_context(schema_name):
+                users = list(User.objects.values_list("pk", "username", "email"))
+
+            entries = []
+            for user_id, username, email in users:
+                logins = {
+                    value.strip().lower()
+                    for value in (username, email)
+                    if value and value.strip()
+                }
+                entries.extend(
+                    TenantLoginIndex(
+                        login=login,
+                        domain=domain,
+                        tenant_user_id=user_id,
+                        tenant_username=username,
+                    )
+                    for login in logins
+                )
+
+            with schema_context(public_schema), transaction.atomic():
+                stale = TenantLoginIndex.objects.filter(domain=domain)
+                stale_logins = list(stale.values_list("login", flat=True))
+                stale.delete()
+                TenantLoginIndex.objects.bulk_create(
+                    entries, batch_size=1000, ignore_conflicts=True
+                )
+            invalidate_lookup_cache(*stale_logins, *(entry.login for entry in entries))
+
+            total += len(entries)
+            self.stdout.write(f"[{schema_name}] {len(entries)} login(s) indexed")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done: {total} login(s) across {len(domains)} tenant(s)"
+            )
+        )
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-16 18:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tenants", "0003_tenantloginticket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantLoginIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "login",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Логин или email пользователя в нижнем регистре",
+                        max_length=254,
+                    ),
+                ),
+                (
+                    "tenant_user_id",
+                    models.BigIntegerField(
+                        help_text="ID пользователя внутри tenant-схемы"
+                    ),
+                ),
+                (
+                    "tenant_username",
+                    models.CharField(
+                        help_text="Имя пользователя внутри tenant-схемы", max_length=150
+                    ),
+                ),
+                (
+                    "domain",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="login_index",
+                        to="app_tenants.domain",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Индекс логинов арендаторов",
+                "verbose_name_plural": "Индекс логинов арендаторов",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("domain", "tenant_user_id", "login"),
+                        name="uniq_tenant_login_index_entry",
+                    )
+                ],
+            },
+        ),
+    ]
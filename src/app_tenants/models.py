@@ -41,6 +41,46 @@ class TenantLogin(models.Model):
         return f"{self.login} → {self.domain}"
 
 
+class TenantLoginIndex(models.Model):
+    """
+    Denormalized index of tenant user logins for the public /into/ page.
+
+    Maintained by signals on the tenant user model (see app_tenants.signals),
+    so the public login lookup is one indexed SELECT instead of a schema scan.
+    """
+
+    login = models.CharField(
+        max_length=254,
+        db_index=True,
+        help_text="Логин или email пользователя в нижнем регистре",
+    )
+    domain = models.ForeignKey(
+        Domain,
+        on_delete=models.CASCADE,
+        related_name="login_index",
+    )
+    tenant_user_id = models.BigIntegerField(
+        help_text="ID пользователя внутри tenant-схемы",
+    )
+    tenant_username = models.CharField(
+        max_length=150,
+        help_text="Имя пользователя внутри tenant-схемы",
+    )
+
+    class Meta:
+        verbose_name = "Индекс логинов арендаторов"
+        verbose_name_plural = "Индекс логинов арендаторов"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["domain", "tenant_user_id", "login"],
+                name="uniq_tenant_login_index_entry",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - string repr only
+        return f"{self.login} → {self.domain}"
+
+
 class TenantLoginTicketManager(models.Manager):
     def issue(
         self,
@@ -79,4 +119,4 @@ class TenantLoginTicket(models.Model):
         verbose_name_plural = "SSO-токены входа"
 
     def is_expired(self) -> bool:
-        return timezone.now() >= self.expires_at
\ No newline at end of file
+        return timezone.now() >= self.expires_at
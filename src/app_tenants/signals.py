@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from app_tenants.lookup_cache import invalidate_lookup_cache
+from app_tenants.models import Domain, TenantLogin, TenantLoginIndex
+
+# Поля пользователя, по которым ищет публичная страница входа
+_LOGIN_FIELDS = frozenset(("username", "email"))
+
+
+def _user_logins(user) -> set[str]:
+    return {
+        value.strip().lower()
+        for value in (user.get_username(), user.email)
+        if value and value.strip()
+    }
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_tenant_login_index(sender, instance, created, raw=False, **kwargs):
+    """
+    Обновляет записи TenantLoginIndex пользователя tenant-схемы.
+
+    Не срабатывает при сохранениях, не затрагивающих логин
+    (например, update_last_login с update_fields={"last_login"}).
+    """
+    if raw:
+        return
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not _LOGIN_FIELDS.intersection(update_fields):
+        return
+
+    schema_name = connection.schema_name
+    public_schema = get_public_schema_name()
+    if schema_name == public_schema:
+        return
+
+    logins = _user_logins(instance)
+    with schema_context(public_schema):
+        domain = Domain.objects.filter(
+            tenant__schema_name=schema_name, is_primary=True
+        ).first()
+        if domain is None:
+            return
+
+        if not created:
+            stale = TenantLoginIndex.objects.filter(
+                domain=domain, tenant_user_id=instance.pk
+            )
+            # Старые логины (до переименования) тоже сбрасываем из кэша
+            invalidate_lookup_cache(*stale.values_list("login", flat=True))
+            stale.delete()
+        TenantLoginIndex.objects.bulk_create(
+            [
+                TenantLoginIndex(
+                    login=login,
+                    domain=domain,
+                    tenant_user_id=instance.pk,
+                    tenant_username=instance.get_username(),
+                )
+                for login in logins
+            ],
+            ignore_conflicts=True,
+        )
+    invalidate_lookup_cache(*logins)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def drop_tenant_login_index(sender, instance, **kwargs):
+    schema_name = connection.schema_name
+    public_schema = get_public_schema_name()
+    if schema_name == public_schema:
+        return
+
+    with schema_context(public_schema):
+        TenantLoginIndex.objects.filter(
+            domain__tenant__schema_name=schema_name,
+            tenant_user_id=instance.pk,
+        ).delete()
+    invalidate_lookup_cache(*_user_logins(instance))
+
+
+@receiver([post_save, post_delete], sender=TenantLogin)
+def invalidate_tenant_login_lookup(sender, instance, **kwargs):
+    invalidate_lookup_cache(instance.login)
@@ -1,12 +1,13 @@
-import json
 import secrets
+from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
 from django_tenants.utils import (get_public_schema_name, get_tenant_model,
                                   schema_context)
 
@@ -16,6 +17,18 @@ try:
 except Exception:  # pragma: no cover
     Role = None  # type: ignore
 
+User = get_user_model()
+
+
+@dataclass(slots=True)
+class TenantPlan:
+    """Нормализованная запись тенанта из JSON (без обращений к БД)."""
+
+    schema_name: str
+    name: str
+    domain: str
+    owner: dict | None
+
 
 class Command(BaseCommand):
     help = (
@@ -48,7 +61,15 @@ class Command(BaseCommand):
         parser.add_argument(
             "--test-password",
             default=None,
-            help="Password for both test users; if omitted, generates random.",
+            help=(
+                "Password for both test users; if omitted, generates one random "
+                "password shared by all tenants."
+            ),
+        )
+        parser.add_argument(
+            "--per-tenant-test-password",
+            action="store_true",
+            help="Without --test-password, generate a separate password per tenant.",
         )
         parser.add_argument(
             "--role-owner",
@@ -78,48 +99,107 @@ class Command(BaseCommand):
             opts["base_domain"] or getattr(settings, "BASE_DOMAIN", None) or "localhost"
         )
 
-        with open(json_path, "r", encoding="utf-8") as f:
+        with open(json_path, "rb") as f:
             try:
-                data = json.load(f)
-            except json.JSONDecodeError as e:
+                data = orjson.loads(f.read())
+            except orjson.JSONDecodeError as e:
                 raise CommandError(f"Invalid JSON: {e}") from e
 
         if not isinstance(data, list):
             raise CommandError("Root of JSON must be a list of tenants")
 
-        for item in data:
-            self._process_tenant_item(item, base_domain, opts)
+        # Один сгенерированный пароль тест-пользователей на весь прогон
+        if (
+            opts.get("create_test_users")
+            and not opts.get("test_password")
+            and not opts.get("per_tenant_test_password")
+        ):
+            opts["shared_test_password"] = self._gen_password()
+            self.stdout.write(
+                self.style.WARNING(
+                    "Generated test users password (all tenants): "
+                    f"{opts['shared_test_password']}"
+                )
+            )
+
+        plans = self._build_plans(data, base_domain)
+        self._bulk_ensure_tenants(plans)
+        self._bulk_ensure_users(plans, opts)
 
         self.stdout.write(self.style.SUCCESS("✅ Seeding finished"))
 
-    # -------- per-tenant processing --------
-    def _process_tenant_item(self, item: dict, base_domain: str, opts: dict):
-        schema_name = item.get("schema_name")
-        name = item.get("name") or schema_name
-        subdomain = item.get("subdomain", "")
-        owner = item.get("owner", None)
+    # -------- фаза 0: валидация и нормализация JSON --------
+    def _build_plans(self, data: list, base_domain: str) -> list[TenantPlan]:
+        plans: list[TenantPlan] = []
+        for item in data:
+            get = item.get
+            schema_name = get("schema_name")
+            if not schema_name:
+                self.stderr.write(
+                    self.style.ERROR("Skipping item without 'schema_name'")
+                )
+                continue
 
-        if not schema_name:
-            self.stderr.write(self.style.ERROR("Skipping item without 'schema_name'"))
-            return
+            subdomain = get("subdomain", "")
+            plans.append(
+                TenantPlan(
+                    schema_name=schema_name,
+                    name=get("name") or schema_name,
+                    domain=f"{subdomain}.{base_domain}" if subdomain else base_domain,
+                    owner=get("owner"),
+                )
+            )
+        return plans
 
-        domain_str = f"{subdomain}.{base_domain}" if subdomain else base_domain
+    # -------- фаза 1: Tenant/Domain/схемы в public — один COMMIT на прогон --------
+    def _bulk_ensure_tenants(self, plans: list[TenantPlan]):
+        existing_schemas = self._existing_schemas([p.schema_name for p in plans])
+        with transaction.atomic(using="default"):
+            for plan in plans:
+                self._ensure_tenant_and_schema(
+                    plan.schema_name, plan.name, plan.domain, existing_schemas
+                )
 
-        tenant = self._ensure_tenant_and_schema(schema_name, name, domain_str)
+    # -------- фаза 2: пользователи — одна транзакция на схему тенанта --------
+    def _bulk_ensure_users(self, plans: list[TenantPlan], opts: dict):
+        for plan in plans:
+            self._process_tenant_users(plan, opts)
 
+    def _process_tenant_users(self, plan: TenantPlan, opts: dict):
+        schema_name, owner, domain_str = plan.schema_name, plan.owner, plan.domain
         # Создание владельца: пропускаем public, т.к. в public нет auth-таблиц
         if schema_name == get_public_schema_name():
             self.stdout.write(f"public: ensured (domain={domain_str}); owner skipped")
         else:
-            if owner:
-                self._ensure_owner(schema_name, owner, opts)
-            if opts.get("create_test_users"):
-                self._create_test_users(schema_name, opts)
+            with schema_context(schema_name), transaction.atomic():
+                assignments: list[tuple] = []
+                if owner:
+                    owner_user = self._ensure_owner(schema_name, owner, opts)
+                    if owner_user is not None:
+                        assignments.append((owner_user, opts.get("role_owner")))
+                if opts.get("create_test_users"):
+                    assignments.extend(self._create_test_users(schema_name, opts))
+                self._assign_roles(assignments)
 
         self.stdout.write(self.style.SUCCESS(f"✓ {schema_name}: ok ({domain_str})"))
 
     # -------- ensure tenant/domain/schema in public --------
-    def _ensure_tenant_and_schema(self, schema: str, tenant_name: str, domain_str: str):
+    @staticmethod
+    def _existing_schemas(schemas: list[str]) -> set[str]:
+        """Одним запросом возвращает схемы из списка, которые уже есть в БД."""
+        if not schemas:
+            return set()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT schema_name FROM information_schema.schemata "
+                "WHERE schema_name = ANY(%s)",
+                [schemas],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def _ensure_tenant_and_schema(
+        self, schema: str, tenant_name: str, domain_str: str, existing_schemas: set[str]
+    ):
         TenantModel = get_tenant_model()
         DomainModel = apps.get_model("app_tenants", "Domain")
 
@@ -128,11 +208,10 @@ class Command(BaseCommand):
                 schema_name=schema,
                 defaults={"name": tenant_name},
             )
-            if created:
-                tenant.save()
-                tenant.create_schema(check_if_exists=True)
-            else:
-                tenant.create_schema(check_if_exists=True)
+            # Новый тенант создаёт схему сам в save() (auto_create_schema);
+            # для существующего — только если схемы нет в предзагруженном списке
+            if not created and schema not in existing_schemas:
+                tenant.create_schema(check_if_exists=False)
 
             dom, d_created = DomainModel.objects.get_or_create(
                 domain=domain_str,
@@ -144,91 +223,105 @@ class Command(BaseCommand):
                 )
         return tenant
 
-    # -------- ensure owner in tenant schema --------
+    # -------- ensure owner in tenant schema (вызывается внутри schema_context) --------
     def _ensure_owner(self, schema: str, owner: dict, opts: dict):
-        username = owner.get("username")
-        email = owner.get("email") or username
-        password = owner.get("password") or self._gen_password()
-        reset = bool(opts.get("reset_owner_password"))
-        role_owner = opts.get("role_owner")
+        get = owner.get
+        username = get("username")
+        raw_password = get("password")
+        email = get("email") or username
+        password = raw_password or self._gen_password()
+        reset = opts.get("reset_owner_password")
 
         if not username:
             self.stderr.write(
                 self.style.WARNING(f"[{schema}] owner without username — skipped")
             )
-            return
+            return None
 
-        with schema_context(schema):
-            User = get_user_model()
-            with transaction.atomic():
-                u, created = User.objects.get_or_create(
-                    username=username,
-                    defaults={
-                        "email": email,
-                        "is_active": True,
-                        "is_staff": True,
-                        "is_superuser": True,
-                    },
-                )
-                if created or reset:
-                    u.set_password(password)
-                    u.save(update_fields=["password"])
-                if role_owner and Role is not None:
-                    r, _ = Role.objects.get_or_create(name=role_owner)
-                    u.groups.add(r)
-
-        if owner.get("password") is None:
+        u, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                "email": email,
+                "is_active": True,
+                "is_staff": True,
+                "is_superuser": True,
+            },
+        )
+        if created or reset:
+            u.set_password(password)
+            u.save(update_fields=["password"])
+
+        if raw_password is None:
             self.stdout.write(
                 self.style.WARNING(f"[{schema}] Generated owner password: {password}")
             )
+        return u
 
-    # -------- create two test users in tenant schema --------
+    # -------- create two test users in tenant schema (внутри schema_context) --------
     def _create_test_users(self, schema: str, opts: dict):
-        pwd = opts.get("test_password") or self._gen_password()
+        shared_pwd = opts.get("test_password") or opts.get("shared_test_password")
+        pwd = shared_pwd or self._gen_password()
         role1 = opts.get("role_test1")
         role2 = opts.get("role_test2")
 
-        with schema_context(schema):
-            User = get_user_model()
-            with transaction.atomic():
-                # test_admin
-                u1, c1 = User.objects.get_or_create(
-                    username="test_admin",
-                    defaults={
-                        "email": f"test_admin@{schema}.local",
-                        "is_active": True,
-                        "is_staff": True,
-                        "is_superuser": True,
-                    },
-                )
-                if c1 or opts.get("test_password"):
-                    u1.set_password(pwd)
-                    u1.save(update_fields=["password"])
-                if role1 and Role is not None:
-                    r1, _ = Role.objects.get_or_create(name=role1)
-                    u1.groups.add(r1)
-
-                # test_user
-                u2, c2 = User.objects.get_or_create(
-                    username="test_user",
-                    defaults={
-                        "email": f"test_user@{schema}.local",
-                        "is_active": True,
-                        "is_staff": False,
-                        "is_superuser": False,
-                    },
-                )
-                if c2 or opts.get("test_password"):
-                    u2.set_password(pwd)
-                    u2.save(update_fields=["password"])
-                if role2 and Role is not None:
-                    r2, _ = Role.objects.get_or_create(name=role2)
-                    u2.groups.add(r2)
-
-        if not opts.get("test_password"):
+        # test_admin
+        u1, c1 = User.objects.get_or_create(
+            username="test_admin",
+            defaults={
+                "email": f"test_admin@{schema}.local",
+                "is_active": True,
+                "is_staff": True,
+                "is_superuser": True,
+            },
+        )
+        if c1 or opts.get("test_password"):
+            u1.set_password(pwd)
+            u1.save(update_fields=["password"])
+
+        # test_user
+        u2, c2 = User.objects.get_or_create(
+            username="test_user",
+            defaults={
+                "email": f"test_user@{schema}.local",
+                "is_active": True,
+                "is_staff": False,
+                "is_superuser": False,
+            },
+        )
+        if c2 or opts.get("test_password"):
+            u2.set_password(pwd)
+            u2.save(update_fields=["password"])
+
+        if not shared_pwd:
             self.stdout.write(
                 self.style.WARNING(f"[{schema}] Generated test users password: {pwd}")
             )
+        return [(u1, role1), (u2, role2)]
+
+    # -------- roles: одна выборка и пакетные вставки на схему --------
+    @staticmethod
+    def _assign_roles(assignments: list[tuple]):
+        if Role is None:
+            return
+        pairs = [(user, role_name) for user, role_name in assignments if role_name]
+        if not pairs:
+            return
+
+        needed = list({role_name for _, role_name in pairs})
+        roles = Role.objects.in_bulk(needed, field_name="name")
+        missing = [Role(name=name) for name in needed if name not in roles]
+        if missing:
+            Role.objects.bulk_create(missing, ignore_conflicts=True)
+            roles = Role.objects.in_bulk(needed, field_name="name")
+
+        Through = User.groups.through
+        Through.objects.bulk_create(
+            [
+                Through(user_id=user.pk, group_id=roles[role_name].pk)
+                for user, role_name in pairs
+            ],
+            ignore_conflicts=True,
+        )
 
     @staticmethod
     def _gen_password(length: int = 14) -> str:
@@ -1,15 +1,21 @@
-from datetime import datetime
-from io import BytesIO
+import time
+from tempfile import SpooledTemporaryFile
 
 from django.contrib import admin
-from django.http import HttpResponse
+from django.http import FileResponse
 from django.shortcuts import render
 from django.urls import path
 from django.utils.translation import gettext_lazy as _
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle
 
 from app_works.models import Work
 
+# До 8 МБ файл экспорта держим в памяти, дальше — сбрасываем на диск
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 2000
+
 
 @admin.register(Work)
 class WorkAdmin(admin.ModelAdmin):
@@ -32,6 +38,23 @@ class WorkAdmin(admin.ModelAdmin):
     list_select_related = ("unit_ref", "supplier_ref")
     actions = ("export_works_to_excel",)
 
+    def get_queryset(self, request):
+        """Оптимизация: справочники одним JOIN, из них — только поля для __str__."""
+        qs = super().get_queryset(request)
+        return qs.select_related("unit_ref", "supplier_ref").only(
+            "name",
+            "unit_ref",
+            "supplier_ref",
+            "price_per_unit",
+            "price_per_labor_hour",
+            "labor_hours",
+            "calculate_only_by_labor",
+            "is_active",
+            "unit_ref__symbol",
+            "supplier_ref__name",
+            "supplier_ref__legal_name",
+        )
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -52,9 +75,9 @@ class WorkAdmin(admin.ModelAdmin):
     
     @admin.action(description=_("Экспорт в Excel"))
     def export_works_to_excel(self, request, queryset):
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = str(_("Работы"))
+        # write_only: строки пишутся потоково, без хранения ячеек в памяти
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=str(_("Работы")))
 
         headers = (
             _("Наименование"),
@@ -65,36 +88,52 @@ class WorkAdmin(admin.ModelAdmin):
             _("Поставщик"),
             _("Считать только по ЧЧ"),
         )
-        worksheet.append([str(header) for header in headers])
+        # Один именованный стиль на шапку; строки данных пишутся без стилей
+        header_style = NamedStyle(name="works_header", font=Font(bold=True))
+        workbook.add_named_style(header_style)
+        header_row = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=str(header))
+            cell.style = header_style.name
+            header_row.append(cell)
+        worksheet.append(header_row)
 
-        queryset = queryset.select_related("unit_ref", "supplier_ref")
+        # values_list с JOIN-полями: без гидрации моделей и select_related
+        rows = queryset.values_list(
+            "name",
+            "unit_ref__symbol",
+            "price_per_unit",
+            "price_per_labor_hour",
+            "labor_hours",
+            "supplier_ref__name",
+            "calculate_only_by_labor",
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
 
-        for work in queryset:
+        for name, unit, ppu, pplh, lh, supplier, only_labor in rows:
             worksheet.append(
                 (
-                    work.name,
-                    str(work.unit_ref) if work.unit_ref else "",
-                    work.price_per_unit,
-                    work.price_per_labor_hour if work.price_per_labor_hour is not None else "",
-                    work.labor_hours,
-                    work.supplier_ref.name if work.supplier_ref else "",
-                    "Да" if work.calculate_only_by_labor else "Нет",
+                    name,
+                    unit or "",
+                    ppu,
+                    pplh if pplh is not None else "",
+                    lh,
+                    supplier or "",
+                    "Да" if only_labor else "Нет",
                 )
             )
 
-        output = BytesIO()
+        output = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
         workbook.save(output)
         output.seek(0)
 
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"works_{timestamp}.xlsx"
+        filename = f"works_{time.strftime('%Y-%m-%d_%H-%M-%S')}.xlsx"
 
-        response = HttpResponse(
-            output.getvalue(),
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
             content_type=(
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             ),
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
 
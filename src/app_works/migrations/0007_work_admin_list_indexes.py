@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-16 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "app_suppliers",
+            "0002_remove_supplier_uniq_supplier_tax_id_nonempty_and_more",
+        ),
+        ("app_units", "0001_initial"),
+        ("app_works", "0006_alter_work_labor_hours_alter_work_price_per_unit"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                fields=["unit_ref", "name"],
+                name="work_unit_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="work",
+            index=models.Index(
+                fields=["calculate_only_by_labor", "name"],
+                name="work_labor_only_name_idx",
+            ),
+        ),
+    ]
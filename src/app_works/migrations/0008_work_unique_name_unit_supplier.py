@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-16 18:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+DUPLICATE_SUFFIX = " (дубликат #{pk})"
+
+
+def deactivate_duplicate_works(apps, schema_editor):
+    """
+    Перед добавлением уникальности (name, unit_ref, supplier_ref) оставляет по
+    одной работе в каждой группе дублей (активную, затем с меньшим id).
+    Остальные не удаляются — на них могут ссылаться сметы: они выключаются и
+    переименовываются с суффиксом «(дубликат #id)».
+    """
+    Work = apps.get_model("app_works", "Work")
+    max_length = Work._meta.get_field("name").max_length
+
+    # GROUP BY считает NULL-поставщиков равными — как и nulls_distinct=False
+    groups = (
+        Work.objects.values("name", "unit_ref_id", "supplier_ref_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for group in groups:
+        works = Work.objects.filter(
+            name=group["name"],
+            unit_ref_id=group["unit_ref_id"],
+            supplier_ref__isnull=group["supplier_ref_id"] is None,
+        )
+        if group["supplier_ref_id"] is not None:
+            works = works.filter(supplier_ref_id=group["supplier_ref_id"])
+        duplicates = list(works.order_by("-is_active", "id")[1:])
+        for work in duplicates:
+            suffix = DUPLICATE_SUFFIX.format(pk=work.pk)
+            work.name = work.name[: max_length - len(suffix)] + suffix
+            work.is_active = False
+        Work.objects.bulk_update(duplicates, ["name", "is_active"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "app_suppliers",
+            "0002_remove_supplier_uniq_supplier_tax_id_nonempty_and_more",
+        ),
+        ("app_units", "0001_initial"),
+        ("app_works", "0007_work_admin_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            deactivate_duplicate_works, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="work",
+            constraint=models.UniqueConstraint(
+                fields=("name", "unit_ref", "supplier_ref"),
+                name="uniq_work_name_unit_supplier",
+                nulls_distinct=False,
+            ),
+        ),
+    ]
@@ -9,6 +9,7 @@
 """
 
 from decimal import Decimal
+from types import MappingProxyType
 
 from django.core.exceptions import ValidationError
 from django.db import models
@@ -16,6 +17,30 @@ from django.utils.translation import gettext_lazy as _
 
 from app_units.models import Unit
 
+# Биты доступных методик расчёта (см. Work._support_mask)
+_SERVICE_BIT = 1
+_LABOR_BIT = 2
+
+_ZERO = Decimal("0")
+
+# Сообщения валидации Work.clean (ленивые, создаются один раз)
+_ERR_PRICE_REQUIRED = _(
+    "Заполните хотя бы одну расценку: за единицу или за человеко-час."
+)
+_ERR_LABOR_PRICE_REQUIRED = _(
+    "Для расчёта только по человеко-часам нужна расценка за человеко-час."
+)
+_ERR_LABOR_HOURS_REQUIRED = _(
+    "Укажите количество человеко-часов для предварительной расценки."
+)
+
+
+def _as_decimal(value) -> Decimal:
+    """Приводит значение поля к Decimal, не пересоздавая уже готовый Decimal."""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(value or 0)
+
 
 class Work(models.Model):
     """
@@ -27,6 +52,13 @@ class Work(models.Model):
         SERVICE = "service", _("Услуга")
         LABOR = "labor", _("Человеко-часы")
 
+    # Порядок перебора и биты методик (подписи и допустимые коды — на уровне модуля)
+    _FALLBACK_METHODS = (CostingMethod.SERVICE, CostingMethod.LABOR)
+    _METHOD_BITS = {
+        CostingMethod.SERVICE: _SERVICE_BIT,
+        CostingMethod.LABOR: _LABOR_BIT,
+    }
+
     name = models.CharField(
         max_length=255,
         db_index=True,
@@ -91,27 +123,51 @@ class Work(models.Model):
         verbose_name = _("Работа")
         verbose_name_plural = _("Работы")
         ordering = ["name", "id"]
+        indexes = [
+            # Фильтры и сортировка changelist'а админки
+            models.Index(
+                fields=["unit_ref", "name"],
+                name="work_unit_name_idx",
+            ),
+            models.Index(
+                fields=["calculate_only_by_labor", "name"],
+                name="work_labor_only_name_idx",
+            ),
+        ]
+        constraints = [
+            # Ключ upsert'а при импорте; работа без поставщика тоже уникальна
+            models.UniqueConstraint(
+                fields=["name", "unit_ref", "supplier_ref"],
+                name="uniq_work_name_unit_supplier",
+                nulls_distinct=False,
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
     # ====== Утилиты расчёта ======
-    def supports_calculation_method(self, method: str) -> bool:
-        def _gt_zero(value: Decimal | None) -> bool:
-            return value is not None and Decimal(value) > 0
-       
-        if method == self.CostingMethod.LABOR:
-            return self.unit_ref_id is not None and _gt_zero(self.price_per_unit)
+    @property
+    def _support_mask(self) -> int:
+        """Битовая маска методик, доступных для работы по текущим полям."""
+        # DecimalField уже отдаёт Decimal — повторная обёртка не нужна
+        price = self.price_per_unit
+        if self.unit_ref_id is None or price is None or not price > 0:
+            return 0
         if self.calculate_only_by_labor:
-            return False
-        # По умолчанию считаем, что услуга доступна, если есть базовые поля
-        return self.unit_ref_id is not None and _gt_zero(self.price_per_unit)
+            return _LABOR_BIT
+        return _SERVICE_BIT | _LABOR_BIT
+
+    def supports_calculation_method(self, method: str) -> bool:
+        # Неизвестный код трактуем как услугу — по умолчанию услуга доступна,
+        # если есть базовые поля
+        return bool(self._support_mask & self._METHOD_BITS.get(method, _SERVICE_BIT))
 
     def resolve_calculation_method(self, requested: str | None = None) -> str:
         """Подбирает корректный метод расчёта для работы."""
 
         requested_code = (requested or "").strip()
-        if requested_code and requested_code not in self.CostingMethod.values:
+        if requested_code and requested_code not in _VALID_METHODS:
             requested_code = ""
 
         if self.calculate_only_by_labor:
@@ -120,16 +176,14 @@ class Work(models.Model):
         if requested_code:
             if self.supports_calculation_method(requested_code):
                 return requested_code
-            method_label = dict(self.CostingMethod.choices).get(
-                requested_code, requested_code
-            )
+            method_label = _COSTING_LABELS.get(requested_code, requested_code)
             raise ValidationError(
                 _('Работа "{name}" не поддерживает метод расчёта "{method}".').format(
                     name=self.name, method=method_label
                 )
             )
 
-        for fallback in (self.CostingMethod.SERVICE, self.CostingMethod.LABOR):
+        for fallback in self._FALLBACK_METHODS:
             if self.supports_calculation_method(fallback):
                 return fallback
 
@@ -148,48 +202,45 @@ class Work(models.Model):
         else:
             price = self.price_per_unit
 
-        if price is None:
+        if price is None or not price > 0:
             return None
-
-        price_dec = Decimal(price)
-        return price_dec if price_dec > 0 else None
+        return price
 
     def available_costing_methods(self) -> list[str]:
-        methods: list[str] = []
-        if self.supports_calculation_method(self.CostingMethod.SERVICE):
-            methods.append(self.CostingMethod.SERVICE)
-        if self.supports_calculation_method(self.CostingMethod.LABOR):
-            methods.append(self.CostingMethod.LABOR)
-        return methods
-    
+        mask = self._support_mask
+        return [m for m in self._FALLBACK_METHODS if mask & self._METHOD_BITS[m]]
+
     def clean(self):
         super().clean()
 
-        errors: dict[str, str] = {}
-
-        price_unit = Decimal(self.price_per_unit or 0)
-        price_labor = Decimal(self.price_per_labor_hour or 0)
-        labor_hours = Decimal(self.labor_hours or 0)
+        price_unit = _as_decimal(self.price_per_unit)
+        price_labor = _as_decimal(self.price_per_labor_hour)
+        labor_hours = _as_decimal(self.labor_hours)
 
         self.price_per_unit = price_unit
         self.price_per_labor_hour = price_labor
         self.labor_hours = labor_hours
 
-        if price_unit <= 0 and price_labor <= 0:
-            msg = _("Заполните хотя бы одну расценку: за единицу или за человеко-час.")
-            errors["price_per_unit"] = msg
-            errors["price_per_labor_hour"] = msg
+        errors: dict[str, str] | None = None
 
-        if self.calculate_only_by_labor and price_labor <= 0:
-            errors["price_per_labor_hour"] = _(
-                "Для расчёта только по человеко-часам нужна расценка за человеко-час."
-            )
+        if price_unit <= _ZERO and price_labor <= _ZERO:
+            errors = {
+                "price_per_unit": _ERR_PRICE_REQUIRED,
+                "price_per_labor_hour": _ERR_PRICE_REQUIRED,
+            }
 
-        if price_labor > 0 and labor_hours <= 0:
-            errors["labor_hours"] = _(
-                "Укажите количество человеко-часов для предварительной расценки."
-            )
+        if self.calculate_only_by_labor and price_labor <= _ZERO:
+            errors = errors or {}
+            errors["price_per_labor_hour"] = _ERR_LABOR_PRICE_REQUIRED
+
+        if price_labor > _ZERO and labor_hours <= _ZERO:
+            errors = errors or {}
+            errors["labor_hours"] = _ERR_LABOR_HOURS_REQUIRED
 
         if errors:
             raise ValidationError(errors)
 
+
+# Неизменяемые справочники методик расчёта (собираются один раз при импорте)
+_COSTING_LABELS = MappingProxyType(dict(Work.CostingMethod.choices))
+_VALID_METHODS = frozenset(Work.CostingMethod.values)
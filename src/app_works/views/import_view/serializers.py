@@ -1,6 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from app_works.views.import_view.services import FileValidator
+
 
 class WorkImportFileSerializer(serializers.Serializer):
     """Сериализатор для загрузки файла импорта работ"""
@@ -13,18 +15,22 @@ class WorkImportFileSerializer(serializers.Serializer):
 
     def validate_file(self, value):
         """Валидация файла"""
-        allowed_extensions = [".xlsx", ".xls"]
         file_name = value.name.lower()
 
-        if not any(file_name.endswith(ext) for ext in allowed_extensions):
+        # Те же правила, что и в FileValidator сервиса импорта
+        if not file_name.endswith(FileValidator.ALLOWED_EXTENSIONS):
             raise serializers.ValidationError(
-                _("Неверный формат файла. Разрешены только .xlsx и .xls")
+                _("Неверный формат файла. Разрешены: {extensions}").format(
+                    extensions=", ".join(FileValidator.ALLOWED_EXTENSIONS)
+                )
             )
 
-        max_size = 10 * 1024 * 1024  # 10MB
-        if value.size > max_size:
+        max_size_mb = FileValidator.MAX_FILE_SIZE // (1024 * 1024)
+        if value.size > FileValidator.MAX_FILE_SIZE:
             raise serializers.ValidationError(
-                _("Файл слишком большой. Максимальный размер: 10MB")
+                _("Файл слишком большой. Максимальный размер: {max_size}MB").format(
+                    max_size=max_size_mb
+                )
             )
 
         return value
@@ -1,10 +1,14 @@
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import openpyxl
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Lower, Trim
 from django.utils.translation import gettext as _
 
 from app_suppliers.models import Supplier
@@ -17,6 +21,65 @@ from app_works.views.import_view.exceptions import (
 )
 from core.utils.numbers import round_decimal_value
 
+# Быстрый ридер Excel (python-calamine); openpyxl остаётся запасным вариантом
+try:
+    from python_calamine import CalamineError, CalamineWorkbook
+except ImportError:  # pragma: no cover
+    CalamineError = None
+    CalamineWorkbook = None
+
+_INVALID_FILE_ERRORS: Tuple[type, ...] = (
+    openpyxl.utils.exceptions.InvalidFileException,
+)
+if CalamineError is not None:
+    _INVALID_FILE_ERRORS += (CalamineError,)
+
+LABOR_FLAG_TRUE_VALUES = frozenset(("да", "yes", "true", "1", "+"))
+# Сентинел для «без поставщика» в ключах поиска: id в БД всегда положительные
+_NO_SUPPLIER_ID = -1
+
+
+@lru_cache(maxsize=4096)
+def _normalize_key(value: str) -> str:
+    """Ключ справочника: символы единиц и имена поставщиков в файле повторяются"""
+    return value.strip().lower()
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _parse_decimal(value: Any) -> Decimal:
+    """
+    Округлённый Decimal по значению ячейки: цены в прайсах сильно повторяются.
+    Ошибки разбора не кэшируются и пробрасываются вызывающему.
+    """
+    return round_decimal_value(value)
+
+
+def _normalize_calamine_value(value: Any) -> Any:
+    """Значение ячейки calamine в том виде, в каком его отдаёт openpyxl"""
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel хранит все числа как float; openpyxl приводит целые к int
+        return int(value)
+    if type(value) is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _normalize_header(value: Any) -> str:
+    # split() без аргументов режет и по NBSP, схлопывая повторные пробелы
+    return " ".join(str(value).split()).lower()
+
+
+def _parse_labor_flag(value: Any) -> bool:
+    """Флаг «Считать только по ЧЧ»: строка «да»/«yes»/…, булево или число 1"""
+    if isinstance(value, str):
+        return value.strip().lower() in LABOR_FLAG_TRUE_VALUES
+    if isinstance(value, (bool, int, float)):
+        # Excel хранит флажки как TRUE/FALSE, ридеры отдают 1 как 1 или 1.0
+        return value == 1
+    return False
+
 
 class WorkImportResult:
     """DTO для результата импорта работ"""
@@ -51,7 +114,7 @@ class WorkImportResult:
 class FileValidator:
     """Валидатор файла импорта работ"""
 
-    ALLOWED_EXTENSIONS = [".xlsx", ".xls"]
+    ALLOWED_EXTENSIONS = (".xlsx", ".xls")
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
     @classmethod
@@ -62,7 +125,7 @@ class FileValidator:
     @classmethod
     def _validate_extension(cls, file: UploadedFile) -> None:
         file_name = file.name.lower()
-        if not any(file_name.endswith(ext) for ext in cls.ALLOWED_EXTENSIONS):
+        if not file_name.endswith(cls.ALLOWED_EXTENSIONS):
             raise InvalidFileFormatException(
                 _("Неверный формат файла. Разрешены: {extensions}").format(
                     extensions=", ".join(cls.ALLOWED_EXTENSIONS)
@@ -93,19 +156,28 @@ class ExcelParser:
     HEADER_ALIASES = {
         "Расценка за человеко-час": "Предварительная расценка за человеко-час",
     }
+    # Нормализованное имя колонки (регистр, NBSP, лишние пробелы) → каноническое
+    NORMALIZED_HEADERS = {
+        **{_normalize_header(column): column for column in ALL_COLUMNS},
+        **{
+            _normalize_header(alias): column for alias, column in HEADER_ALIASES.items()
+        },
+    }
 
-    def parse(self, file: UploadedFile) -> List[Dict[str, Any]]:
-        try:
-            workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
-            sheet = workbook.active
+    def parse(self, file: UploadedFile) -> Iterator[Dict[str, Any]]:
+        """
+        Потоково отдаёт строки листа, не собирая их в список.
 
-            headers = self._extract_headers(sheet)
+        Генератор: файл открывается при первом next(), закрывается по исчерпании.
+        Проверку «файл без данных» выполняет потребитель.
+        """
+        rows = self._read_rows(file)
+        try:
+            headers = self._extract_headers(next(rows, ()))
             self._validate_headers(headers)
 
-            data = self._extract_data(sheet, headers)
-            workbook.close()
-            return data
-        except openpyxl.utils.exceptions.InvalidFileException:
+            yield from self._extract_data(rows, headers)
+        except _INVALID_FILE_ERRORS:
             raise InvalidFileFormatException(
                 _(
                     "Не удалось прочитать файл. Убедитесь, что это корректный Excel файл."
@@ -117,15 +189,51 @@ class ExcelParser:
             raise FileProcessingException(
                 _("Ошибка при чтении файла: {error}").format(error=str(exc))
             )
+        finally:
+            rows.close()
+
+    def _read_rows(self, file: UploadedFile) -> Iterator[Sequence[Any]]:
+        """Строки первого листа как последовательности значений, начиная с шапки"""
+        if CalamineWorkbook is not None:
+            return self._read_rows_calamine(file)
+        return self._read_rows_openpyxl(file)
 
-    def _extract_headers(self, sheet) -> Dict[str, int]:
+    @staticmethod
+    def _read_rows_calamine(file: UploadedFile) -> Iterator[Sequence[Any]]:
+        # Нативный (Rust) ридер: значения сразу Python-типами, без объектов ячеек
+        if hasattr(file, "temporary_file_path"):
+            workbook = CalamineWorkbook.from_path(file.temporary_file_path())
+        else:
+            workbook = CalamineWorkbook.from_filelike(file)
+        sheet = workbook.get_sheet_by_index(0)
+        # iter_rows() строит Python-строки по одной (to_python() собрал бы весь
+        # лист сразу). Пустые строки до начала данных он отдаёт сам, а пустые
+        # столбцы слева — нет: дополняем, чтобы индексы совпадали с Excel
+        first_column = sheet.start[1] if sheet.start else 0
+        padding = (None,) * first_column
+        for row in sheet.iter_rows():
+            yield padding + tuple(_normalize_calamine_value(value) for value in row)
+
+    @staticmethod
+    def _read_rows_openpyxl(file: UploadedFile) -> Iterator[Sequence[Any]]:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            if not sheet.max_row or sheet.max_row <= 1:
+                # Некоторые генераторы пишут неверный <dimension ref="A1"> —
+                # в этом случае читаем поток строк до конца
+                sheet.reset_dimensions()
+            yield from sheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    def _extract_headers(self, header_row: Sequence[Any]) -> Dict[str, int]:
         headers: Dict[str, int] = {}
-        for cell in sheet[1]:
-            if cell.value:
-                header_name = str(cell.value).strip()
-                canonical_name = self.HEADER_ALIASES.get(header_name, header_name)
-                if canonical_name in self.ALL_COLUMNS:
-                    headers[canonical_name] = cell.column - 1
+        for column_index, value in enumerate(header_row):
+            if value:
+                canonical_name = self.NORMALIZED_HEADERS.get(_normalize_header(value))
+                if canonical_name:
+                    headers[canonical_name] = column_index
         return headers
 
     def _validate_headers(self, headers: Dict[str, int]) -> None:
@@ -137,38 +245,50 @@ class ExcelParser:
                 )
             )
 
-    def _extract_data(self, sheet, headers: Dict[str, int]) -> List[Dict[str, Any]]:
-        data: List[Dict[str, Any]] = []
-        for row_index, row in enumerate(sheet.iter_rows(min_row=2), start=2):
-            row_data: Dict[str, Any] = {"_row": row_index}
-            for column_name, column_index in headers.items():
-                row_data[column_name] = row[column_index].value
-
-            if self._is_empty_row(row_data):
+    def _extract_data(
+        self, rows: Iterable[Sequence[Any]], headers: Dict[str, int]
+    ) -> Iterator[Dict[str, Any]]:
+        columns = list(headers.items())
+        required_indices = [headers[column] for column in self.REQUIRED_COLUMNS]
+        # Короткие строки (сброшенные размеры листа) дополняем до нужной ширины
+        width = max(headers.values()) + 1
+        for row_index, row in enumerate(rows, start=2):
+            if len(row) < width:
+                row = (*row, *(None,) * (width - len(row)))
+
+            if self._is_empty_row(row, required_indices):
                 continue
 
-            data.append(row_data)
+            row_data: Dict[str, Any] = {"_row": row_index}
+            for column_name, column_index in columns:
+                row_data[column_name] = row[column_index]
 
-        if not data:
-            raise InvalidFileStructureException(_("Файл не содержит данных"))
+            yield row_data
 
-        return data
-
-    def _is_empty_row(self, row_data: Dict[str, Any]) -> bool:
-        return all(
-            row_data.get(column) is None or str(row_data.get(column)).strip() == ""
-            for column in self.REQUIRED_COLUMNS
-        )
+    def _is_empty_row(self, row: Sequence[Any], required_indices: List[int]) -> bool:
+        # Числа и даты из Excel приходят уже типизированными и пустыми не бывают,
+        # поэтому str() нужен только для строк; выходим на первой заполненной ячейке
+        for index in required_indices:
+            value = row[index]
+            if value is not None and (not isinstance(value, str) or value.strip()):
+                return False
+        return True
 
 
 class WorkDataValidator:
     """Валидатор данных строки работы"""
 
     @staticmethod
-    def validate_row(row: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    def validate_row(
+        row: Dict[str, Any],
+    ) -> Tuple[bool, Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Проверяет строку и сразу возвращает разобранные значения,
+        чтобы цены не парсились повторно при подготовке.
+        """
         name = row.get("Наименование")
         if not name or str(name).strip() == "":
-            return False, _("Наименование не может быть пустым")
+            return False, _("Наименование не может быть пустым"), None
 
         price_raw = row.get("Цена")
         labor_price_raw = row.get("Предварительная расценка за человеко-час")
@@ -178,19 +298,23 @@ class WorkDataValidator:
 
         if price_raw is not None and str(price_raw).strip() != "":
             try:
-                price_decimal = round_decimal_value(price_raw)
+                price_decimal = _parse_decimal(price_raw)
                 if price_decimal < 0:
-                    return False, _("Цена не может быть отрицательной")
+                    return False, _("Цена не может быть отрицательной"), None
             except (InvalidOperation, ValueError):
-                return False, _("Некорректное значение цены")
+                return False, _("Некорректное значение цены"), None
 
         if labor_price_raw is not None and str(labor_price_raw).strip() != "":
             try:
-                labor_decimal = round_decimal_value(labor_price_raw)
+                labor_decimal = _parse_decimal(labor_price_raw)
                 if labor_decimal < 0:
-                    return False, _("Стоимость человеко-часа не может быть отрицательной")
+                    return (
+                        False,
+                        _("Стоимость человеко-часа не может быть отрицательной"),
+                        None,
+                    )
             except (InvalidOperation, ValueError):
-                return False, _("Некорректное значение стоимости человеко-часа")
+                return False, _("Некорректное значение стоимости человеко-часа"), None
 
         if (price_decimal is None or price_decimal == 0) and (
             labor_decimal is None or labor_decimal == 0
@@ -200,162 +324,204 @@ class WorkDataValidator:
                 _(
                     "Укажите цену за единицу или предварительную расценку за человеко-час"
                 ),
+                None,
             )
 
-        labor_flag = str(row.get("Считать только по ЧЧ") or "").strip().lower()
-        if labor_flag in ("да", "yes", "true", "1", "+") and (
-            labor_decimal is None or labor_decimal == 0
-        ):
+        calculate_only_by_labor = _parse_labor_flag(row.get("Считать только по ЧЧ"))
+        if calculate_only_by_labor and (labor_decimal is None or labor_decimal == 0):
             return (
                 False,
                 _(
                     "Для расчёта только по человеко-часам заполните предварительную расценку"
                 ),
+                None,
             )
 
-        return True, None
+        unit_symbol = str(row.get("Единица измерения")).strip()
+
+        supplier_raw = row.get("Поставщик")
+        supplier_key = None
+        supplier_name_clean = None
+        if supplier_raw:
+            # Значения ячеек уже типизированы: str() только для не-строк
+            supplier_name_clean = (
+                supplier_raw.strip()
+                if isinstance(supplier_raw, str)
+                else str(supplier_raw).strip()
+            ) or None
+            if supplier_name_clean:
+                supplier_key = _normalize_key(supplier_name_clean)
+
+        return (
+            True,
+            None,
+            {
+                "name": str(name).strip(),
+                "unit_symbol": unit_symbol,
+                "unit_key": _normalize_key(unit_symbol),
+                "price": price_decimal if price_decimal is not None else Decimal("0"),
+                "supplier_key": supplier_key,
+                "supplier_name": supplier_name_clean,
+                "row_number": row.get("_row", 0),
+                "price_per_labor_hour": labor_decimal,
+                "calculate_only_by_labor": calculate_only_by_labor,
+            },
+        )
 
 
 class WorkImportProcessor:
     """Процессор импорта работ"""
 
-    BATCH_SIZE = 500
+    BATCH_SIZE = getattr(settings, "WORK_IMPORT_BATCH_SIZE", 1000)
+    EXISTING_KEYS_CHUNK_SIZE = 500
 
     def __init__(self) -> None:
-        self.units_cache: Dict[str, Unit] = {}
-        self.suppliers_cache: Dict[str, Supplier] = {}
-        self.existing_works: Dict[Tuple[str, int, Optional[int]], Work] = {}
-        self._load_units()
-        self._load_suppliers()
-
-    def _load_units(self) -> None:
-        for unit in Unit.objects.all():
-            self.units_cache[unit.symbol.strip().lower()] = unit
-
-    def _load_suppliers(self) -> None:
-        """Кэширование поставщиков по name"""
-        for supplier in Supplier.objects.all():
-            self.suppliers_cache[supplier.name.strip().lower()] = supplier
-
-    def _load_existing_works(self, keys: Set[Tuple[str, int, Optional[int]]]) -> None:
+        # Кэши справочников хранят только id: дальше нужны лишь *_ref_id
+        self.units_cache: Dict[str, int] = {}
+        self.suppliers_cache: Dict[str, int] = {}
+        self.existing_keys: Set[Tuple[str, int, Optional[int]]] = set()
+        # Ключи, уже записанные в текущем импорте (дубликаты между батчами)
+        self.processed_keys: Set[Tuple[str, int, Optional[int]]] = set()
+        # Ключи единиц, которые уже запрашивались (включая не найденные)
+        self.loaded_unit_keys: Set[str] = set()
+        self.errors: List[Dict[str, Any]] = []
+
+    def _load_units(self, unit_keys: Iterable[str]) -> None:
+        """Догружает в кэш только единицы, встреченные в файле"""
+        keys = set(unit_keys) - self.loaded_unit_keys
         if not keys:
-            self.existing_works = {}
             return
+        self.loaded_unit_keys |= keys
 
-        names = {name for name, _, _ in keys}
-        unit_ids = {unit_id for _, unit_id, _ in keys}
-        supplier_ids = {
-            supplier_id for _, _, supplier_id in keys if supplier_id is not None
-        }
-        require_null_supplier = any(supplier_id is None for _, _, supplier_id in keys)
-
-        query = Work.objects.filter(name__in=names, unit_ref_id__in=unit_ids)
-
-        supplier_conditions = Q()
-        if supplier_ids:
-            supplier_conditions |= Q(supplier_ref_id__in=supplier_ids)
-        if require_null_supplier:
-            supplier_conditions |= Q(supplier_ref__isnull=True)
+        self.units_cache.update(
+            # Ключи из файла уже обрезаны — обрезаем и символ в справочнике
+            Unit.objects.annotate(symbol_ci=Lower(Trim("symbol")))
+            .filter(symbol_ci__in=keys)
+            .values_list("symbol_ci", "id")
+        )
 
-        if supplier_conditions:
-            query = query.filter(supplier_conditions)
+    def _load_existing_works(
+        self, keys: Iterable[Tuple[str, int, Optional[int]]]
+    ) -> None:
+        """Ключи уже существующих работ — только для подсчёта created/updated"""
+        # Точное совпадение троек вместо декартова name__in × unit__in.
+        # NULL-поставщик сводится к сентинелу через Coalesce, чтобы все условия
+        # имели одну форму без ветки supplier_ref__isnull
+        self.existing_keys = set()
+        key_list = list(keys)
+        works = Work.objects.annotate(
+            supplier_key=Coalesce("supplier_ref_id", Value(_NO_SUPPLIER_ID))
+        )
+        for start in range(0, len(key_list), self.EXISTING_KEYS_CHUNK_SIZE):
+            condition = Q()
+            for name, unit_id, supplier_id in key_list[
+                start : start + self.EXISTING_KEYS_CHUNK_SIZE
+            ]:
+                condition |= Q(
+                    name=name,
+                    unit_ref_id=unit_id,
+                    supplier_key=(
+                        _NO_SUPPLIER_ID if supplier_id is None else supplier_id
+                    ),
+                )
 
-        existing = query.select_related("unit_ref", "supplier_ref")
+            existing = (
+                works.filter(condition)
+                .order_by()
+                .values_list("name", "unit_ref_id", "supplier_ref_id")
+            )
+            self.existing_keys.update(
+                (name.strip(), unit_id, supplier_id)
+                for name, unit_id, supplier_id in existing
+            )
 
-        self.existing_works = {
-            (work.name.strip(), work.unit_ref_id, work.supplier_ref_id): work
-            for work in existing
-        }
+    def iter_batches(
+        self, data: Iterable[Dict[str, Any]]
+    ) -> Iterator[List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Лениво валидирует строки и отдаёт их батчами по BATCH_SIZE.
 
-    def process_data(
-        self, data: List[Dict[str, Any]]
-    ) -> Tuple[int, int, int, List[Dict[str, Any]]]:
+        Ошибки валидации копятся в self.errors; запись батча — flush_batch().
+        """
         validator = WorkDataValidator()
-        errors: List[Dict[str, Any]] = []
-        valid_rows: List[Dict[str, Any]] = []
+        batch: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        seen_any = False
 
         for row in data:
+            seen_any = True
             row_number = row.get("_row", 0)
-            is_valid, error_message = validator.validate_row(row)
+            is_valid, error_message, cleaned = validator.validate_row(row)
             if not is_valid:
-                errors.append(
+                self.errors.append(
                     {"row": row_number, "field": "Общая", "error": error_message}
                 )
                 continue
 
+            batch.append((row, cleaned))
+
+            if len(batch) >= self.BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if not seen_any:
+            raise InvalidFileStructureException(_("Файл не содержит данных"))
+
+        if batch:
+            yield batch
+
+    def get_errors(self) -> List[Dict[str, Any]]:
+        # Ошибки подготовки копятся по батчам — возвращаем в порядке строк файла
+        return sorted(self.errors, key=lambda error: error["row"])
+
+    def flush_batch(
+        self, rows: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> Tuple[int, int, int]:
+        self._load_units(cleaned["unit_key"] for _, cleaned in rows)
+
+        valid_rows: List[Dict[str, Any]] = []
+        for row, cleaned in rows:
             try:
-                prepared_row = self._prepare_row_data(row)
-                valid_rows.append(prepared_row)
+                valid_rows.append(self._prepare_row_data(row, cleaned))
             except Exception as exc:
-                errors.append({"row": row_number, "field": "Общая", "error": str(exc)})
+                self.errors.append(
+                    {"row": cleaned["row_number"], "field": "Общая", "error": str(exc)}
+                )
 
         if not valid_rows:
-            return 0, 0, 0, errors
+            return 0, 0, 0
 
         self._ensure_suppliers_exist(valid_rows)
 
         self._attach_suppliers(valid_rows)
 
-        existing_keys = {row["work_key"] for row in valid_rows}
+        # Дубликаты внутри файла убираем до запросов к работам:
+        # при повторе ключа побеждает последняя строка
+        unique_rows = {row["work_key"]: row for row in valid_rows}
+        duplicates = len(valid_rows) - len(unique_rows)
 
-        self._load_existing_works(existing_keys)
+        self._load_existing_works(unique_rows.keys())
 
-        created, updated, skipped = self._bulk_upsert_works(valid_rows)
-        return created, updated, skipped, errors
+        created, updated, skipped = self._bulk_upsert_works(unique_rows.values())
+        return created, updated, skipped + duplicates
 
-    def _prepare_row_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
-        name = str(row.get("Наименование")).strip()
-        unit_symbol = str(row.get("Единица измерения")).strip()
-        price_raw = row.get("Цена")
-        price = (
-            round_decimal_value(price_raw)
-            if price_raw is not None and str(price_raw).strip() != ""
-            else Decimal("0")
+    def _prepare_row_data(
+        self, row: Dict[str, Any], cleaned: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Дополняет разобранную валидатором строку единицей и трудозатратами"""
+        cleaned["unit_id"] = self._get_unit_id(
+            cleaned["unit_key"], cleaned["unit_symbol"]
         )
 
-        unit = self._get_unit(unit_symbol)
-
-        supplier_name = row.get("Поставщик")
-        supplier_key = None
-        supplier_name_clean = None
-        if supplier_name and str(supplier_name).strip():
-            supplier_name_clean = str(supplier_name).strip()
-            supplier_key = supplier_name_clean.lower()
-
-        price_per_labor_hour = None
-        labor_hour_value = row.get("Предварительная расценка за человеко-час")
-        if labor_hour_value is not None and str(labor_hour_value).strip() != "":
-            try:
-                price_per_labor_hour = round_decimal_value(labor_hour_value)
-            except (InvalidOperation, ValueError):
-                pass
-
         labor_hours = Decimal("0")
         labor_hours_value = row.get("Кол-во человеко-часов")
         if labor_hours_value is not None and str(labor_hours_value).strip() != "":
             try:
-                labor_hours = round_decimal_value(labor_hours_value)
+                labor_hours = _parse_decimal(labor_hours_value)
             except (InvalidOperation, ValueError):
                 pass
+        cleaned["labor_hours"] = labor_hours
 
-        calculate_only_by_labor = False
-        labor_flag = row.get("Считать только по ЧЧ")
-        if labor_flag:
-            labor_flag_str = str(labor_flag).strip().lower()
-            if labor_flag_str in ("да", "yes", "true", "1", "+"):
-                calculate_only_by_labor = True
-
-        return {
-            "name": name,
-            "unit": unit,
-            "price": price,
-            "supplier_key": supplier_key,
-            "supplier_name": supplier_name_clean,
-            "row_number": row.get("_row", 0),
-            "price_per_labor_hour": price_per_labor_hour,
-            "labor_hours": labor_hours,
-            "calculate_only_by_labor": calculate_only_by_labor,
-        }
+        return cleaned
 
     def _ensure_suppliers_exist(self, valid_rows: List[Dict[str, Any]]) -> None:
         """Создание новых поставщиков батчем с заполнением legal_name"""
@@ -369,6 +535,16 @@ class WorkImportProcessor:
         if not new_supplier_names:
             return
 
+        # Сначала добираем тех, кто уже есть в БД, затем создаём только отсутствующих
+        self._cache_suppliers_by_keys(new_supplier_names.keys())
+        truly_missing = {
+            key: name
+            for key, name in new_supplier_names.items()
+            if key not in self.suppliers_cache
+        }
+        if not truly_missing:
+            return
+
         new_suppliers = [
             Supplier(
                 name=name,
@@ -377,38 +553,58 @@ class WorkImportProcessor:
                 vat_registered=True,
                 is_active=True,
             )
-            for name in new_supplier_names.values()
+            for name in truly_missing.values()
         ]
 
-        Supplier.objects.bulk_create(new_suppliers, ignore_conflicts=True)
-
-        created_or_existing = Supplier.objects.filter(
-            name__in=list(new_supplier_names.values())
+        Supplier.objects.bulk_create(
+            new_suppliers, batch_size=self.BATCH_SIZE, ignore_conflicts=True
         )
 
-        for supplier in created_or_existing:
-            self.suppliers_cache[supplier.name.strip().lower()] = supplier
+        self._cache_suppliers_by_keys(truly_missing.keys())
+
+    def _cache_suppliers_by_keys(self, keys: Iterable[str]) -> None:
+        """
+        Один запрос по уже нормализованным ключам.
+
+        Ключи уже обрезаны, поэтому и имя в справочнике сравниваем через
+        Lower(Trim("name")) — как символы единиц в _load_units. Иначе имя с
+        пробелами по краям не найдётся и bulk_create создаст дубликат.
+        """
+        self.suppliers_cache.update(
+            Supplier.objects.annotate(name_ci=Lower(Trim("name")))
+            .filter(name_ci__in=list(keys))
+            .values_list("name_ci", "id")
+        )
 
     def _attach_suppliers(self, valid_rows: List[Dict[str, Any]]) -> None:
-        """Добавляет объекты поставщиков и ключи работ к строкам"""
+        """Добавляет id поставщиков и ключи работ к строкам"""
         for row in valid_rows:
-            supplier = None
+            supplier_id = None
             supplier_key = row.get("supplier_key")
             if supplier_key:
-                supplier = self.suppliers_cache.get(supplier_key)
-
-            supplier_id = supplier.id if supplier else None
+                supplier_id = self.suppliers_cache.get(supplier_key)
 
-            row["supplier"] = supplier
             row["supplier_id"] = supplier_id
-            row["work_key"] = (row["name"], row["unit"].id, supplier_id)
+            row["work_key"] = (row["name"], row["unit_id"], supplier_id)
+
+    UPSERT_UNIQUE_FIELDS = ["name", "unit_ref", "supplier_ref"]
+    UPSERT_UPDATE_FIELDS = [
+        "price_per_unit",
+        "price_per_labor_hour",
+        "labor_hours",
+        "calculate_only_by_labor",
+        "is_active",
+    ]
 
     def _bulk_upsert_works(
-        self, valid_rows: List[Dict[str, Any]]
+        self, valid_rows: Iterable[Dict[str, Any]]
     ) -> Tuple[int, int, int]:
-        works_to_create: List[Work] = []
-        works_to_update: List[Work] = []
-        processed_keys: Set[Tuple[str, int, Optional[int]]] = set()
+        """
+        Один INSERT ... ON CONFLICT DO UPDATE на батч
+        (по ограничению uniq_work_name_unit_supplier).
+        """
+        works: List[Work] = []
+        processed_keys = self.processed_keys
         created = 0
         updated = 0
         skipped = 0
@@ -416,65 +612,41 @@ class WorkImportProcessor:
         for row in valid_rows:
             key = row["work_key"]
 
+            # Ключ уже записан предыдущим батчем: перезаписываем (последняя
+            # строка побеждает), но считаем как пропущенный дубликат
             if key in processed_keys:
                 skipped += 1
-                continue
-
-            existing = self.existing_works.get(key)
-
-            if existing:
-                existing.price_per_unit = row["price"]
-                existing.supplier_ref = row.get("supplier")
-                existing.price_per_labor_hour = row.get("price_per_labor_hour")
-                existing.labor_hours = row.get("labor_hours")
-                existing.calculate_only_by_labor = row.get("calculate_only_by_labor", False)
-                existing.is_active = True
-                works_to_update.append(existing)
-                processed_keys.add(key)
+            elif key in self.existing_keys:
                 updated += 1
-                continue
-
-            work = Work(
-                name=row["name"],
-                unit_ref=row["unit"],
-                price_per_unit=row["price"],
-                price_per_labor_hour=row.get("price_per_labor_hour"),
-                labor_hours=row.get("labor_hours"),
-                calculate_only_by_labor=row.get("calculate_only_by_labor", False),
-                supplier_ref=row.get("supplier"),
-                is_active=True,
-            )
-            works_to_create.append(work)
+            else:
+                created += 1
             processed_keys.add(key)
 
-            if len(works_to_create) >= self.BATCH_SIZE:
-                created += len(
-                    Work.objects.bulk_create(works_to_create, ignore_conflicts=True)
+            works.append(
+                Work(
+                    name=row["name"],
+                    unit_ref_id=row["unit_id"],
+                    price_per_unit=row["price"],
+                    price_per_labor_hour=row.get("price_per_labor_hour"),
+                    labor_hours=row.get("labor_hours"),
+                    calculate_only_by_labor=row.get("calculate_only_by_labor", False),
+                    supplier_ref_id=row["supplier_id"],
+                    is_active=True,
                 )
-                works_to_create = []
-
-        if works_to_create:
-            created += len(
-                Work.objects.bulk_create(works_to_create, ignore_conflicts=True)
             )
 
-        if works_to_update:
-            Work.objects.bulk_update(
-                works_to_update,
-                [
-                    "price_per_unit",
-                    "supplier_ref",
-                    "price_per_labor_hour",
-                    "labor_hours",
-                    "calculate_only_by_labor",
-                    "is_active",
-                ],
+        if works:
+            Work.objects.bulk_create(
+                works,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=self.UPSERT_UNIQUE_FIELDS,
+                update_fields=self.UPSERT_UPDATE_FIELDS,
             )
 
         return created, updated, skipped
 
-    def _get_unit(self, unit_symbol: str) -> Unit:
-        unit_key = unit_symbol.strip().lower()
+    def _get_unit_id(self, unit_key: str, unit_symbol: str) -> int:
         if unit_key not in self.units_cache:
             raise ValueError(
                 _("Единица измерения '{unit}' не найдена в справочнике").format(
@@ -491,14 +663,31 @@ class WorkImportService:
         self.file_validator = FileValidator()
         self.excel_parser = ExcelParser()
 
-    def import_works(self, file: UploadedFile) -> WorkImportResult:
+    def import_works(
+        self, file: UploadedFile, *, validated: bool = False
+    ) -> WorkImportResult:
+        """
+        validated=True — расширение и размер уже проверены
+        (WorkImportFileSerializer), повторная проверка пропускается.
+        """
         try:
-            self.file_validator.validate(file)
+            if not validated:
+                self.file_validator.validate(file)
             data = self.excel_parser.parse(file)
 
-            with transaction.atomic():
-                processor = WorkImportProcessor()
-                created, updated, skipped, errors = processor.process_data(data)
+            processor = WorkImportProcessor()
+            created = updated = skipped = 0
+            # Транзакция на батч: короткие блокировки, без одной гигантской
+            # транзакции на весь файл
+            for batch in processor.iter_batches(data):
+                with transaction.atomic():
+                    batch_created, batch_updated, batch_skipped = processor.flush_batch(
+                        batch
+                    )
+                created += batch_created
+                updated += batch_updated
+                skipped += batch_skipped
+            errors = processor.get_errors()
 
             status_value = self._determine_status(created, updated, errors)
             message = self._build_message(created, updated, skipped, errors)
@@ -6,7 +6,6 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .exceptions import (
-    FileProcessingException,
     InvalidFileFormatException,
     InvalidFileStructureException,
     WorkImportException,
@@ -19,10 +18,8 @@ class WorkImportViewSet(APIView):
     """API для импорта работ из Excel"""
 
     permission_classes = [IsAuthenticated]
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.import_service = WorkImportService()
+    # Сервис без состояния (валидатор + парсер) — один экземпляр на все запросы
+    import_service = WorkImportService()
 
     @extend_schema(
         summary=_("Импорт работ из Excel"),
@@ -62,46 +59,26 @@ class WorkImportViewSet(APIView):
         file = serializer.validated_data["file"]
 
         try:
-            result = self.import_service.import_works(file)
-
-            result_serializer = WorkImportResultSerializer(data=result.to_dict())
-            result_serializer.is_valid(raise_exception=True)
+            # Файл уже прошёл validate_file сериализатора
+            result = self.import_service.import_works(file, validated=True)
 
-            return Response(result_serializer.data, status=status.HTTP_200_OK)
+            # WorkImportResultSerializer описывает ответ только для схемы:
+            # результат сервиса уже типизирован, повторная валидация не нужна
+            return Response(result.to_dict(), status=status.HTTP_200_OK)
 
-        except InvalidFileFormatException as exc:
-            return Response(
-                {
-                    "status": "error",
-                    "message": str(exc),
-                    "errors": [],
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        except InvalidFileStructureException as exc:
-            return Response(
-                {
-                    "status": "error",
-                    "message": str(exc),
-                    "errors": [],
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        except FileProcessingException as exc:
-            return Response(
-                {
-                    "status": "error",
-                    "message": str(exc),
-                    "errors": [],
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        except (InvalidFileFormatException, InvalidFileStructureException) as exc:
+            return self._error_response(exc, status.HTTP_400_BAD_REQUEST)
         except WorkImportException as exc:
-            return Response(
-                {
-                    "status": "error",
-                    "message": str(exc),
-                    "errors": [],
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+            # FileProcessingException и прочие ошибки импорта
+            return self._error_response(exc, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def _error_response(exc: Exception, status_code: int) -> Response:
+        return Response(
+            {
+                "status": "error",
+                "message": str(exc),
+                "errors": [],
+            },
+            status=status_code,
+        )
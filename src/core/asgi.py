@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_asgi_application()
+
+from core.urls_common import warm_up_url_resolvers  # noqa: E402
+
+warm_up_url_resolvers()
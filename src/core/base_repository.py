@@ -10,12 +10,35 @@
 - Reusability: общие методы для всех репозиториев
 """
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
-
+import hashlib
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Model, QuerySet
 
 ModelType = TypeVar("ModelType", bound=Model)
 
+# Время жизни закэшированного count() в секундах
+COUNT_CACHE_TIMEOUT = 60
+# Размер порции для iter_queryset
+ITER_CHUNK_SIZE = 2000
+
+
+def _default_batch_size() -> int:
+    return getattr(settings, "DEFAULT_BULK_BATCH_SIZE", 1000)
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -26,12 +49,16 @@ class BaseRepository(Generic[ModelType]):
     Example:
         class EstimateRepository(BaseRepository[Estimate]):
             model = Estimate
+            default_select_related = ("source_file",)
 
             def get_with_groups(self, estimate_id: int) -> Estimate:
                 return self.get_by_id(estimate_id, prefetch_related=['groups'])
     """
 
     model: Type[ModelType] = None
+    # Связи, подгружаемые всегда (защита от N+1, если вызывающий их забыл)
+    default_select_related: Tuple[str, ...] = ()
+    default_prefetch_related: Tuple[str, ...] = ()
 
     def __init__(self):
         if self.model is None:
@@ -44,6 +71,8 @@ class BaseRepository(Generic[ModelType]):
         obj_id: int,
         select_related: Optional[List[str]] = None,
         prefetch_related: Optional[List[str]] = None,
+        only: Optional[List[str]] = None,
+        defer: Optional[List[str]] = None,
     ) -> Optional[ModelType]:
         """
         Получить объект по ID с оптимизацией запросов.
@@ -52,17 +81,17 @@ class BaseRepository(Generic[ModelType]):
             obj_id: ID объекта
             select_related: Список связей для select_related
             prefetch_related: Список связей для prefetch_related
+            only: Загружать только эти поля (см. get_queryset)
+            defer: Не загружать эти поля
 
         Returns:
             Объект модели или None
         """
         qs = self.model.objects.all()
 
-        if select_related:
-            qs = qs.select_related(*select_related)
+        qs = self._with_related(qs, select_related, prefetch_related)
 
-        if prefetch_related:
-            qs = qs.prefetch_related(*prefetch_related)
+        qs = self._restrict_fields(qs, only, defer)
 
         return qs.filter(pk=obj_id).first()
 
@@ -72,15 +101,23 @@ class BaseRepository(Generic[ModelType]):
         select_related: Optional[List[str]] = None,
         prefetch_related: Optional[List[str]] = None,
         order_by: Optional[List[str]] = None,
+        only: Optional[List[str]] = None,
+        defer: Optional[List[str]] = None,
     ) -> QuerySet[ModelType]:
         """
         Получить QuerySet с фильтрацией и оптимизацией.
 
+        При совместном использовании only и select_related поля связанных
+        моделей указываются через "__" (например, "author__name"), а сама
+        связь не должна быть отложена — иначе Django выбросит FieldError.
+
         Args:
             filters: Словарь фильтров для QuerySet.filter(**filters)
             select_related: Список связей для select_related
             prefetch_related: Список связей для prefetch_related
             order_by: Список полей для сортировки
+            only: Загружать только эти поля
+            defer: Не загружать эти поля
 
         Returns:
             QuerySet модели
@@ -90,17 +127,86 @@ class BaseRepository(Generic[ModelType]):
         if filters:
             qs = qs.filter(**filters)
 
-        if select_related:
-            qs = qs.select_related(*select_related)
-
-        if prefetch_related:
-            qs = qs.prefetch_related(*prefetch_related)
+        qs = self._with_related(qs, select_related, prefetch_related)
 
         if order_by:
             qs = qs.order_by(*order_by)
 
+        return self._restrict_fields(qs, only, defer)
+
+    def iter_queryset(
+        self, chunk_size: int = ITER_CHUNK_SIZE, **kwargs
+    ) -> Iterator[ModelType]:
+        """
+        Итерировать объекты порциями без загрузки всего QuerySet в память.
+
+        На PostgreSQL используется серверный курсор. prefetch_related
+        выполняется отдельно для каждой порции из chunk_size объектов,
+        поэтому для связей «к одному» предпочтительнее select_related.
+
+        Args:
+            chunk_size: Размер порции, читаемой из курсора
+            **kwargs: Аргументы get_queryset (filters, select_related, ...)
+
+        Returns:
+            Итератор объектов модели
+        """
+        return self.get_queryset(**kwargs).iterator(chunk_size=chunk_size)
+
+    def _with_related(
+        self,
+        qs: QuerySet[ModelType],
+        select_related: Optional[List[str]],
+        prefetch_related: Optional[List[str]],
+    ) -> QuerySet[ModelType]:
+        """
+        Применить select_related/prefetch_related: связи по умолчанию
+        репозитория объединяются с переданными (без дублей, порядок сохраняется).
+        """
+        select = list(
+            dict.fromkeys((*self.default_select_related, *(select_related or ())))
+        )
+        if select:
+            qs = qs.select_related(*select)
+
+        prefetch = list(
+            dict.fromkeys((*self.default_prefetch_related, *(prefetch_related or ())))
+        )
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+
         return qs
 
+    @staticmethod
+    def _restrict_fields(
+        qs: QuerySet[ModelType],
+        only: Optional[List[str]],
+        defer: Optional[List[str]],
+    ) -> QuerySet[ModelType]:
+        """Применить only()/defer() после select_related/prefetch_related"""
+        if only:
+            qs = qs.only(*only)
+
+        if defer:
+            qs = qs.defer(*defer)
+
+        return qs
+
+    def get_or_none(self, **filters) -> Optional[ModelType]:
+        """
+        Получить первый объект по фильтрам одним запросом.
+
+        Заменяет пару exists()/count() + get_by_id(): существование
+        определяется по результату (None — объекта нет).
+
+        Args:
+            **filters: Фильтры для QuerySet.filter()
+
+        Returns:
+            Объект модели или None
+        """
+        return self.model.objects.filter(**filters).first()
+
     def exists(self, **filters) -> bool:
         """
         Проверить существование объекта по фильтрам.
@@ -113,6 +219,21 @@ class BaseRepository(Generic[ModelType]):
         """
         return self.model.objects.filter(**filters).exists()
 
+    def pk_exists(self, obj_id: int) -> bool:
+        """
+        Проверить существование объекта по ID без загрузки строки.
+
+        Компилируется в SELECT 1 ... WHERE pk = %s LIMIT 1 — дешевле,
+        чем get_by_id(), когда нужен только факт существования.
+
+        Args:
+            obj_id: ID объекта
+
+        Returns:
+            True если объект существует
+        """
+        return self.model.objects.filter(pk=obj_id).exists()
+
     def count(self, **filters) -> int:
         """
         Подсчитать количество объектов по фильтрам.
@@ -125,6 +246,31 @@ class BaseRepository(Generic[ModelType]):
         """
         return self.model.objects.filter(**filters).count()
 
+    def cached_count(self, timeout: int = COUNT_CACHE_TIMEOUT, **filters) -> int:
+        """
+        Подсчитать количество объектов с кэшированием результата.
+
+        Ключ строится из схемы тенанта, модели и хэша SQL-запроса, поэтому
+        разные фильтры не могут получить чужое значение. Значение не
+        инвалидируется при изменениях — только по истечении timeout.
+
+        Args:
+            timeout: Время жизни значения в секундах
+            **filters: Фильтры для QuerySet.filter()
+
+        Returns:
+            Количество объектов
+        """
+        queryset = self.model.objects.filter(**filters)
+        # SQL и параметры хэшируем раздельно: str(query) не экранирует значения
+        sql, params = queryset.query.sql_with_params()
+        key = "repo_count:{schema}:{model}:{query}".format(
+            schema=getattr(connection, "schema_name", "public"),
+            model=self.model._meta.label_lower,
+            query=hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest(),
+        )
+        return cache.get_or_set(key, queryset.count, timeout)
+
     def create(self, **fields) -> ModelType:
         """
         Создать объект.
@@ -137,17 +283,37 @@ class BaseRepository(Generic[ModelType]):
         """
         return self.model.objects.create(**fields)
 
-    def bulk_create(self, instances: List[ModelType]) -> List[ModelType]:
+    def bulk_create(
+        self,
+        instances: List[ModelType],
+        batch_size: Optional[int] = None,
+        ignore_conflicts: bool = False,
+        update_conflicts: bool = False,
+        update_fields: Optional[List[str]] = None,
+        unique_fields: Optional[List[str]] = None,
+    ) -> List[ModelType]:
         """
-        Массовое создание объектов.
+        Массовое создание объектов батчами.
 
         Args:
             instances: Список экземпляров модели
+            batch_size: Размер батча (по умолчанию DEFAULT_BULK_BATCH_SIZE)
+            ignore_conflicts: Пропускать строки, нарушающие ограничения
+            update_conflicts: Обновлять существующие строки (ON CONFLICT DO UPDATE)
+            update_fields: Поля для обновления при конфликте
+            unique_fields: Поля ограничения уникальности для конфликта
 
         Returns:
             Список созданных объектов
         """
-        return self.model.objects.bulk_create(instances)
+        return self.model.objects.bulk_create(
+            instances,
+            batch_size=batch_size or _default_batch_size(),
+            ignore_conflicts=ignore_conflicts,
+            update_conflicts=update_conflicts,
+            update_fields=update_fields,
+            unique_fields=unique_fields,
+        )
 
     def update(self, obj_id: int, **fields) -> bool:
         """
@@ -163,6 +329,40 @@ class BaseRepository(Generic[ModelType]):
         updated = self.model.objects.filter(pk=obj_id).update(**fields)
         return updated > 0
 
+    def bulk_update(
+        self,
+        instances: List[ModelType],
+        fields: List[str],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Массовое обновление полей у набора объектов.
+
+        Args:
+            instances: Список экземпляров модели с изменёнными значениями
+            fields: Поля для обновления
+            batch_size: Размер батча (по умолчанию DEFAULT_BULK_BATCH_SIZE)
+
+        Returns:
+            Количество обновлённых строк
+        """
+        return self.model.objects.bulk_update(
+            instances, fields, batch_size=batch_size or _default_batch_size()
+        )
+
+    def update_many(self, filters: Dict[str, Any], **fields) -> int:
+        """
+        Обновить все объекты по фильтрам одним UPDATE.
+
+        Args:
+            filters: Словарь фильтров для QuerySet.filter(**filters)
+            **fields: Поля для обновления
+
+        Returns:
+            Количество обновлённых строк
+        """
+        return self.model.objects.filter(**filters).update(**fields)
+
     def delete(self, obj_id: int) -> bool:
         """
         Удалить объект по ID.
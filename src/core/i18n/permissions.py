@@ -1,6 +1,7 @@
-from django.utils.text import format_lazy
-from django.utils.translation import gettext_lazy as _
-from django.utils.translation import pgettext_lazy
+from functools import lru_cache
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils.translation import get_language, gettext, pgettext_lazy
 
 PERMISSION_LABELS = {
     "add": pgettext_lazy("permission", "Может добавлять {model}"),
@@ -10,26 +11,48 @@ PERMISSION_LABELS = {
 }
 
 
-def human_permission_name(perm):
+def human_permission_name(perm) -> str:
+    # Права почти не меняются: кэшируем готовую строку по натуральному ключу
+    # ContentType (id в разных tenant-схемах различаются) и активному языку
+    content_type = perm.content_type
+    return _human_permission_name_cached(
+        content_type.app_label,
+        content_type.model,
+        perm.codename,
+        perm.name,
+        get_language(),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _human_permission_name_cached(
+    app_label: str,
+    model: str,
+    codename: str,
+    perm_name: str,
+    language: str,
+) -> str:
     # Разбираем codename: "<action>_<model>"
-    action, _, rest = perm.codename.partition("_")
+    action, _sep, _rest = codename.partition("_")
 
     # Пытаемся получить verbose_name модели; иначе берём имя из ContentType или исходное название права
-    model_cls = perm.content_type.model_class()
+    content_type = ContentType(app_label=app_label, model=model)
+    model_cls = content_type.model_class()
     model_name = (
         getattr(getattr(model_cls, "_meta", None), "verbose_name", None)
-        or getattr(perm.content_type, "name", None)
-        or perm.name
+        or getattr(content_type, "name", None)
+        or perm_name
     )
 
+    # Функция вызывается под активным языком: переводы сразу разрешаем в str,
+    # без вложенных format_lazy-прокси
+    quoted_model = f"«{model_name}»"
     label = PERMISSION_LABELS.get(action)
     if label:
         # «Может добавлять «Смету»» — модель оборачиваем в ёлочки
-        return format_lazy(label, model=format_lazy("«{}»", model_name))
+        return str(label).format(model=quoted_model)
 
     # Фолбэк для нестандартных действий: export, publish, и т.п.
-    return format_lazy(
-        _("Разрешение: {action} {model}"),
-        action=action,
-        model=format_lazy("«{}»", model_name),
+    return gettext("Разрешение: {action} {model}").format(
+        action=action, model=quoted_model
     )
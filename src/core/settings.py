@@ -254,6 +254,18 @@ REST_FRAMEWORK = {
 }
 # Настройки DRF ===================================================== END
 
+# Импорт справочников ======================================================
+# Размер батча для bulk-операций импорта работ (для PostgreSQL выигрыш
+# от батча выходит на плато около 1000 строк)
+WORK_IMPORT_BATCH_SIZE = env("WORK_IMPORT_BATCH_SIZE", 1000, cast=int)
+# Импорт справочников ================================================== END
+
+
+# Репозитории ==============================================================
+# Размер батча по умолчанию для bulk_create/bulk_update в BaseRepository
+DEFAULT_BULK_BATCH_SIZE = env("DEFAULT_BULK_BATCH_SIZE", 1000, cast=int)
+# Репозитории ========================================================== END
+
 
 class CustomAdminSite:
     site_header = _("ERP - METISone")
@@ -262,5 +274,8 @@ class CustomAdminSite:
 
 
 TENANT_NOT_FOUND_VIEW = "core.tenant_nf.tenant_not_found"
+# Шаблон адреса арендатора для редиректа с общей страницы входа /into/
+# (тенанты пока работают по http; для HTTPS — "https://{domain}{path}")
+TENANT_URL_TEMPLATE = env("TENANT_URL_TEMPLATE", "http://{domain}{path}")
 
 USE_X_FORWARDED_HOST = True
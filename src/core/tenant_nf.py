@@ -1,4 +1,4 @@
-from django.http import JsonResponse
+from core.utils.responses import FastJsonResponse
 
 
 def tenant_not_found(request):
@@ -12,4 +12,4 @@ def tenant_not_found(request):
         # "path": request.path,
         # "schema": getattr(connection, "schema_name", "?"),
     }
-    return JsonResponse(info, status=404, json_dumps_params={"ensure_ascii": False})
+    return FastJsonResponse(info, status=404)
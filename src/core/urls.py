@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.urls import include, path
 
 from core.settings import CustomAdminSite
-from core.views_public import into_login_view
+from core.urls_common import LOGIN_PATTERNS
 from core.views_tenant import tenant_sso_login_view
 
 # from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
@@ -14,10 +14,7 @@ from core.views_tenant import tenant_sso_login_view
 # ]
 
 
-urlpatterns = [
-    path("i18n/", include("django.conf.urls.i18n")),
-    path("sso/login/", tenant_sso_login_view, name="tenant_sso_login"),
-    path("into/", into_login_view, name="public-into-login"),
+API_PATTERNS = [
     # path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     # path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="docs"),
     path("api/v1/", include("app_outlay.urls")),
@@ -26,10 +23,18 @@ urlpatterns = [
     path("api/v1/", include("app_technical_cards.urls")),
 ]
 
-urlpatterns += i18n_patterns(
+I18N_PATTERNS = i18n_patterns(
     path("admin/", admin.site.urls),
 )
 
+urlpatterns = [
+    path("i18n/", include("django.conf.urls.i18n")),
+    path("sso/login/", tenant_sso_login_view, name="tenant_sso_login"),
+    *LOGIN_PATTERNS,
+    *API_PATTERNS,
+    *I18N_PATTERNS,
+]
+
 admin.site.site_header = CustomAdminSite.site_header
 admin.site.site_title = CustomAdminSite.site_title
 admin.site.index_title = CustomAdminSite.index_title
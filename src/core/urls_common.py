@@ -0,0 +1,21 @@
+"""
+Маршруты, общие для tenant- (core.urls) и public- (core.urls_public) URLconf.
+"""
+
+from django.conf import settings
+from django.urls import get_resolver, path
+
+from core.views_public import into_login_view
+
+LOGIN_PATTERNS = [
+    path("into/", into_login_view, name="public-into-login"),
+]
+
+
+def warm_up_url_resolvers() -> None:
+    """
+    Импортирует оба URLconf и строит таблицы reverse до первого запроса,
+    чтобы эту работу не оплачивал первый пользователь воркера.
+    """
+    for urlconf in (settings.ROOT_URLCONF, settings.PUBLIC_SCHEMA_URLCONF):
+        get_resolver(urlconf).reverse_dict
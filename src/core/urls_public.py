@@ -1,19 +1,27 @@
 from django.http import HttpResponse
 from django.urls import path
 
-from core.views_public import into_login_view
+from core.urls_common import LOGIN_PATTERNS
+
+# Служебные ответы отдаём готовыми bytes — без кодирования str на каждый запрос
+_TEXT_CONTENT_TYPE = "text/plain; charset=utf-8"
+_WHOAMI_BODY = b"schema=public"
 
 
 def whoami_public(request):
-    return HttpResponse("schema=public", content_type="text/plain")
+    return HttpResponse(_WHOAMI_BODY, content_type=_TEXT_CONTENT_TYPE)
 
 
 def host_echo_public(request):
-    return HttpResponse(f"host={request.get_host()}", content_type="text/plain")
+    # get_host() уже провалидирован по ALLOWED_HOSTS и состоит из ASCII
+    return HttpResponse(
+        b"host=" + request.get_host().encode("ascii", "ignore"),
+        content_type=_TEXT_CONTENT_TYPE,
+    )
 
 
 urlpatterns = [
     path("__whoami__/", whoami_public),
     path("__host__/", host_echo_public),
-    path("into/", into_login_view, name="public-into-login"),
+    *LOGIN_PATTERNS,
 ]
@@ -2,10 +2,27 @@
 Утилиты для работы с числовыми значениями.
 """
 
+import re
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Any
 
+_DECIMAL_COMMA_TRANS = str.maketrans({",": "."})
 
+# Строки, которые Decimal(...).quantize() вернул бы без изменений: ASCII-цифры,
+# без ведущих нулей, ровно precision знаков после точки. Точность не выше 6:
+# начиная с 7 знаков str(Decimal) может дать экспоненту ("1E-7")
+_PREFORMATTED = {
+    precision: re.compile(
+        rf"-?(?:0|[1-9][0-9]*)\.[0-9]{{{precision}}}"
+        if precision
+        else r"-?(?:0|[1-9][0-9]*)"
+    )
+    for precision in range(7)
+}
+
+
+@lru_cache(maxsize=32)
 def _quantizer(precision: int) -> Decimal:
     return Decimal("1").scaleb(-precision)
 
@@ -17,8 +34,12 @@ def round_decimal_value(value: Any, precision: int = 2) -> Decimal:
     Возвращает Decimal, чтобы сохранить точность для дальнейших операций.
     """
 
-    decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
-    return decimal_value.quantize(_quantizer(precision))
+    if isinstance(value, Decimal):
+        return value.quantize(_quantizer(precision))
+    if type(value) is int:
+        # int переводится в Decimal точно, без разбора строки (bool сюда не попадает)
+        return Decimal(value).quantize(_quantizer(precision))
+    return Decimal(str(value)).quantize(_quantizer(precision))
 
 
 def format_number_to_string(value: Any, precision: int = 2) -> str:
@@ -35,6 +56,9 @@ def format_number_to_string(value: Any, precision: int = 2) -> str:
     if isinstance(value, bool):
         return str(value).strip()
 
+    if precision == 0 and type(value) is int:
+        return str(value)
+
     try:
         decimal_value: Decimal | None = None
 
@@ -44,9 +68,14 @@ def format_number_to_string(value: Any, precision: int = 2) -> str:
             candidate = value.strip()
             if candidate == "":
                 return ""
+            preformatted = _PREFORMATTED.get(precision)
+            if preformatted is not None and preformatted.fullmatch(candidate):
+                return candidate
+            # Строки с запятой и точкой одновременно всё равно не парсятся
+            # в Decimal, поэтому достаточно заменить все запятые за один проход
             normalized_candidate = (
-                candidate.replace(",", ".", 1)
-                if "," in candidate and "." not in candidate
+                candidate.translate(_DECIMAL_COMMA_TRANS)
+                if "," in candidate
                 else candidate
             )
             decimal_value = round_decimal_value(normalized_candidate, precision)
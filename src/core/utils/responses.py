@@ -0,0 +1,18 @@
+"""
+HTTP-ответы общего назначения.
+"""
+
+from typing import Any
+
+import orjson
+from django.http import HttpResponse
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    JSON-ответ, сериализуемый сразу в bytes (UTF-8, без \\u-экранирования).
+    """
+
+    def __init__(self, data: Any, **kwargs) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(orjson.dumps(data), **kwargs)
@@ -1,17 +1,27 @@
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
+from functools import lru_cache
 
 from django import forms
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 from django_tenants.utils import schema_context
 
-from app_tenants.models import Domain, TenantLogin, TenantLoginTicket
+from app_tenants.lookup_cache import LOOKUP_CACHE_TIMEOUT, lookup_cache_key
+from app_tenants.models import (
+    Domain,
+    TenantLogin,
+    TenantLoginIndex,
+    TenantLoginTicket,
+)
+
+_URL_TEMPLATE = getattr(settings, "TENANT_URL_TEMPLATE", "http://{domain}{path}")
 
 
 class IntoLoginForm(forms.Form):
@@ -29,12 +39,31 @@ class TenantTarget:
 
 
 def _lookup_tenant(login: str) -> TenantTarget | None:
+    """
+    Кэширует найденного арендатора на LOOKUP_CACHE_TIMEOUT.
+
+    Промахи не кэшируются: кэш локален для воркера, а сигналы сбрасывают
+    его только в одном процессе — новый пользователь должен входить сразу.
+    """
+
+    cache_key = lookup_cache_key(login)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return TenantTarget(*cached)
+
+    target = _lookup_tenant_uncached(login)
+    if target is not None:
+        cache.set(cache_key, astuple(target), LOOKUP_CACHE_TIMEOUT)
+    return target
+
+
+def _lookup_tenant_uncached(login: str) -> TenantTarget | None:
     try:
         record = TenantLogin.objects.select_related("domain__tenant").get(
             login__iexact=login, is_active=True
         )
     except TenantLogin.DoesNotExist:
-        return _lookup_tenant_by_scanning(login)
+        return _lookup_tenant_by_index(login)
     tenant = record.domain.tenant
     return TenantTarget(
         schema_name=tenant.schema_name,
@@ -48,48 +77,123 @@ def _authenticate_in_schema(target: TenantTarget, password: str, request: HttpRe
         return authenticate(request, username=target.tenant_username, password=password)
 
 
-def _lookup_tenant_by_scanning(login: str) -> TenantTarget | None:
-    """Fallback: iterate over tenant schemas and look for the login."""
+def _lookup_tenant_by_index(login: str) -> TenantTarget | None:
+    """Single indexed lookup in TenantLoginIndex; scan if it gives no answer."""
 
+    entries = list(
+        TenantLoginIndex.objects.select_related("domain__tenant")
+        .filter(login=login.strip().lower())
+        .order_by("domain_id")
+    )
+
+    # Как и при сканировании: первый арендатор, где логин однозначен
+    users_by_domain: dict[int, list[TenantLoginIndex]] = {}
+    for entry in entries:
+        users_by_domain.setdefault(entry.domain_id, []).append(entry)
+    for domain_entries in users_by_domain.values():
+        if len(domain_entries) == 1:
+            entry = domain_entries[0]
+            return TenantTarget(
+                schema_name=entry.domain.tenant.schema_name,
+                domain=entry.domain.domain,
+                tenant_username=entry.tenant_username,
+            )
+
+    # Индекс пуст или неполон для этого логина (не заполнен до деплоя,
+    # см. rebuild_tenant_login_index) — ищем по схемам и дописываем
+    target = _lookup_tenant_by_scanning(login)
+    if target is not None:
+        _backfill_login_index(login, target)
+    return target
+
+
+def _backfill_login_index(login: str, target: TenantTarget) -> None:
     UserModel = get_user_model()
+    with schema_context(target.schema_name):
+        user_id = (
+            UserModel.objects.filter(username=target.tenant_username)
+            .values_list("pk", flat=True)
+            .first()
+        )
+    domain = Domain.objects.filter(domain=target.domain).first()
+    if user_id is None or domain is None:
+        return
+    TenantLoginIndex.objects.bulk_create(
+        [
+            TenantLoginIndex(
+                login=login.strip().lower(),
+                domain=domain,
+                tenant_user_id=user_id,
+                tenant_username=target.tenant_username,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _lookup_tenant_by_scanning(login: str) -> TenantTarget | None:
+    """Fallback: look for the login in all tenant schemas with one UNION ALL query."""
+
     normalized_login = login.strip()
 
-    domains = (
-        Domain.objects.select_related("tenant")
-        .filter(is_primary=True)
+    targets = tuple(
+        Domain.objects.filter(is_primary=True)
         .exclude(tenant__schema_name="public")
+        .values_list("tenant__schema_name", "domain")
     )
-
-    for domain in domains:
-        tenant = domain.tenant
-        with schema_context(tenant.schema_name):
-            try:
-                user = UserModel.objects.get(
-                    Q(username__iexact=normalized_login)
-                    | Q(email__iexact=normalized_login)
-                )
-            except UserModel.DoesNotExist:
-                continue
-            except UserModel.MultipleObjectsReturned:
-                continue
-            else:
-                return TenantTarget(
-                    schema_name=tenant.schema_name,
-                    domain=domain.domain,
-                    tenant_username=user.get_username(),
-                )
+    if not targets:
+        return None
+
+    schema_names = tuple(schema_name for schema_name, _domain in targets)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _login_scan_sql(schema_names),
+            [normalized_login, normalized_login] * len(schema_names),
+        )
+        rows = cursor.fetchall()
+
+    # Как и раньше: первая схема, где логин однозначен (0 — нет, 2 — неоднозначно)
+    usernames_by_target: dict[int, list[str]] = {}
+    for target_index, username in rows:
+        usernames_by_target.setdefault(target_index, []).append(username)
+    for target_index, (schema_name, domain) in enumerate(targets):
+        usernames = usernames_by_target.get(target_index, ())
+        if len(usernames) == 1:
+            return TenantTarget(
+                schema_name=schema_name,
+                domain=domain,
+                tenant_username=usernames[0],
+            )
     return None
 
 
-def _build_redirect_url(domain: str, request: HttpRequest, path: str) -> str:
-    # пока у тебя тенанты работают по http (без https), можно оставить так:
-    scheme = "http"
+@lru_cache(maxsize=8)
+def _login_scan_sql(schema_names: tuple[str, ...]) -> str:
+    """
+    UNION ALL по таблицам пользователей всех схем — один запрос вместо
+    переключения search_path и SELECT на каждого арендатора.
 
-    # если потом сделаешь HTTPS для demo2.metisone.com — поменяешь на "https"
-    # или вернёшь логику с is_secure(), но БЕЗ портов
+    Кэшируется по набору схем, поэтому новые/удалённые арендаторы
+    подхватываются без сигналов и без общего для воркеров состояния.
+    Условия совпадают с функциональными индексами user_*_lower_idx.
+    """
+    UserModel = get_user_model()
+    quote_name = connection.ops.quote_name
+    table = quote_name(UserModel._meta.db_table)
+    username = quote_name(UserModel._meta.get_field(UserModel.USERNAME_FIELD).column)
+    email = quote_name(UserModel._meta.get_field("email").column)
+    return " UNION ALL ".join(
+        f"(SELECT {index} AS target, {username} FROM {quote_name(schema_name)}.{table}"
+        f" WHERE LOWER({username}) = LOWER(%s) OR LOWER({email}) = LOWER(%s)"
+        " LIMIT 2)"
+        for index, schema_name in enumerate(schema_names)
+    )
 
+
+def _build_redirect_url(domain: str, request: HttpRequest, path: str) -> str:
+    # Схема задаётся в settings.TENANT_URL_TEMPLATE (без портов)
     normalized_path = path if path.startswith("/") else f"/{path}"
-    return f"{scheme}://{domain}{normalized_path}"
+    return _URL_TEMPLATE.format(domain=domain, path=normalized_path)
 
 
 @require_http_methods(["GET", "POST"])
@@ -120,7 +224,5 @@ def into_login_view(request: HttpRequest) -> HttpResponse:
                 )
                 messages.success(request, _("Успешный вход. Перенаправляем…"))
                 sso_path = f"/sso/login/?token={ticket.token}"
-                return redirect(
-                    _build_redirect_url(target.domain, request, sso_path)
-                )
+                return redirect(_build_redirect_url(target.domain, request, sso_path))
     return render(request, "public/into_login.html", {"form": form})
@@ -1,14 +1,26 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login
-from django.db import connection, transaction
+from django.db import connection
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_GET
-from django_tenants.utils import schema_context
+from django_tenants.utils import get_public_schema_name
 
 from app_tenants.models import TenantLoginTicket
 
+# Таблица билетов живёт в public: квалифицируем её схемой, чтобы не
+# переключать search_path туда и обратно (два лишних SET на запрос)
+_CONSUME_TICKET_SQL = (
+    "DELETE FROM {schema}.{table} "
+    "WHERE token = %s AND schema_name = %s "
+    "RETURNING tenant_username, backend_path, redirect_to, expires_at"
+).format(
+    schema=connection.ops.quote_name(get_public_schema_name()),
+    table=connection.ops.quote_name(TenantLoginTicket._meta.db_table),
+)
+
 
 @require_GET
 def tenant_sso_login_view(request: HttpRequest) -> HttpResponse:
@@ -18,44 +30,28 @@ def tenant_sso_login_view(request: HttpRequest) -> HttpResponse:
         messages.error(request, _("Отсутствует токен SSO"))
         return redirect(default_redirect)
 
-    ticket_payload: dict | None = None
-    error_message: str | None = None
-
     current_schema = connection.schema_name
 
-    with schema_context("public"):
-        with transaction.atomic():
-            ticket = (
-                TenantLoginTicket.objects.select_for_update()
-                .filter(token=token)
-                .first()
-            )
-            if ticket is None:
-                error_message = _("Ссылка для входа больше не действительна")
-            elif ticket.schema_name != current_schema:
-                error_message = _("Токен предназначен для другого арендатора")
-            elif ticket.is_expired():
-                error_message = _("Срок действия токена истёк")
-                ticket.delete()
-            else:
-                ticket_payload = {
-                    "tenant_username": ticket.tenant_username,
-                    "backend_path": ticket.backend_path,
-                    "redirect_to": ticket.redirect_to,
-                }
-                ticket.delete()
+    # Один атомарный DELETE … RETURNING вместо SELECT FOR UPDATE + DELETE:
+    # билет одноразовый и удаляется, даже если уже просрочен
+    with connection.cursor() as cursor:
+        cursor.execute(_CONSUME_TICKET_SQL, [token, current_schema])
+        row = cursor.fetchone()
+
+    if row is None:
+        messages.error(request, _("Ссылка для входа больше не действительна"))
+        return redirect(default_redirect)
 
-    if error_message:
-        messages.error(request, error_message)
+    tenant_username, backend_path, redirect_to, expires_at = row
+    if expires_at <= timezone.now():
+        messages.error(request, _("Срок действия токена истёк"))
         return redirect(default_redirect)
 
-    assert ticket_payload is not None
-    redirect_to = ticket_payload["redirect_to"] or "/"
-    backend_path = ticket_payload["backend_path"]
+    redirect_to = redirect_to or "/"
 
     UserModel = get_user_model()
     try:
-        user = UserModel.objects.get(username=ticket_payload["tenant_username"])
+        user = UserModel.objects.get(username=tenant_username)
     except UserModel.DoesNotExist:
         messages.error(request, _("Пользователь не найден"))
         return redirect(default_redirect)
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
+
+from core.urls_common import warm_up_url_resolvers  # noqa: E402
+
+warm_up_url_resolvers()